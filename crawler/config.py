@@ -0,0 +1,48 @@
+"""
+Crawler yapilandirmasi.
+
+MongoDB baglantisi ortam degiskeninden okunur; RSS kaynaklari ve
+istek ayarlari burada tek yerde tutulur.
+"""
+
+import os
+
+MONGO_CONNECTION_STRING = os.getenv(
+    "MONGO_CONNECTION_STRING", "mongodb://localhost:27017")
+VERITABANI_ADI = "veerify"
+KOLEKSIYON_ADI = "articles"
+LOG_KOLEKSIYON_ADI = "crawler_logs"
+
+USER_AGENT = (
+    "VeerifyBot/1.0 (+https://github.com/frauvate/fake-news-detection)")
+REQUEST_TIMEOUT = 10
+REQUEST_DELAY = 2
+
+RSS_FEEDS = {
+    "sozcu": [
+        "https://www.sozcu.com.tr/feeds-rss-category-sozcu",
+        "https://www.sozcu.com.tr/feeds-rss-category-gundem",
+        "https://www.sozcu.com.tr/feeds-rss-category-ekonomi",
+        "https://www.sozcu.com.tr/feeds-rss-category-spor",
+        "https://www.sozcu.com.tr/feeds-rss-category-dunya",
+    ],
+    "ntv": [
+        "https://www.ntv.com.tr/son-dakika.rss",
+        "https://www.ntv.com.tr/gundem.rss",
+        "https://www.ntv.com.tr/turkiye.rss",
+        "https://www.ntv.com.tr/dunya.rss",
+        "https://www.ntv.com.tr/ekonomi.rss",
+        "https://www.ntv.com.tr/spor.rss",
+        "https://www.ntv.com.tr/teknoloji.rss",
+        "https://www.ntv.com.tr/saglik.rss",
+    ],
+    "cnnturk": [
+        "https://www.cnnturk.com/feed/rss/all/news",
+    ],
+    "haberturk": [
+        "https://www.haberturk.com/rss",
+    ],
+    "trthaber": [
+        "https://www.trthaber.com/sondakika.rss",
+    ],
+}
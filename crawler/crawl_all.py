@@ -0,0 +1,464 @@
+"""
+Manuel (HTML kaziyici) crawler'lar.
+
+RSS'te yer almayan haberler icin Hurriyet ve Sozcu ana sayfalarini
+ve Hurriyet kategori sayfalarini dogrudan tarar.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import shelve
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from selectolax.parser import HTMLParser
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp yoksa kategori taramasi seri calisir
+    aiohttp = None
+
+from config import (
+    KOLEKSIYON_ADI,
+    LOG_KOLEKSIYON_ADI,
+    REQUEST_TIMEOUT,
+    USER_AGENT,
+)
+from crawl_with_rss import haberleri_kaydet
+from database import ensure_indexes, get_db
+
+HURRIYET_BASE_URL = "https://www.hurriyet.com.tr"
+SOZCU_BASE_URL = "https://www.sozcu.com.tr"
+HURRIYET_KATEGORILER = ["", "gundem", "ekonomi", "spor", "dunya", "teknoloji"]
+MAX_HABER = 50
+
+# Daraltilmis secicilerle filtreleme C tarafinda (Lexbor) yapilir;
+# Python'a yalnizca aday dugumler gecer.
+_HURRIYET_LINK_SEL = ('a[href*="/haber/"], a[href*="/gundem/"], '
+                      'a[href*="/ekonomi/"], a[href*="/spor/"]')
+_SOZCU_LINK_SEL = 'a[href*="sozcu.com.tr"]'
+# Haber detay URL'lerinin son parcasinda sayi bulunur; kontrol tek
+# C seviyesi regex taramasiyla yapilir.
+_SOZCU_SON_PARCA_SAYILI_RE = re.compile(r'/[^/]*\d[^/]*/?$')
+
+
+def _url_anahtari(href):
+    """goruldu kumeleri icin 16 baytlik BLAKE2b anahtari uretir.
+
+    Tam URL dizgisi yerine sabit boyutlu ozet saklamak, uzun taramalarda
+    girdi basina bellegi ~120 bayttan 16 bayta indirir.
+    """
+    return hashlib.blake2b(href.encode("utf-8"), digest_size=16).digest()
+
+# ETag / Last-Modified degerleri kosullar arasi burada saklanir;
+# degismemis ana sayfalar 304 ile govdesiz doner.
+_HTTP_CACHE_YOLU = os.path.join(os.path.dirname(__file__), ".http_cache")
+
+
+def _kosul_basliklari(url):
+    """Onbellekteki dogrulayicilardan If-None-Match/If-Modified-Since uretir."""
+    try:
+        with shelve.open(_HTTP_CACHE_YOLU) as cache:
+            onceki = cache.get(url)
+    except Exception:
+        return {}
+    headers = {}
+    if onceki:
+        if onceki.get("etag"):
+            headers["If-None-Match"] = onceki["etag"]
+        if onceki.get("last_modified"):
+            headers["If-Modified-Since"] = onceki["last_modified"]
+    return headers
+
+
+def _dogrulayicilari_kaydet(url, response_headers):
+    """Yanitin ETag/Last-Modified degerlerini sonraki kosul icin saklar."""
+    etag = response_headers.get("ETag")
+    last_modified = response_headers.get("Last-Modified")
+    if not etag and not last_modified:
+        return
+    try:
+        with shelve.open(_HTTP_CACHE_YOLU) as cache:
+            cache[url] = {"etag": etag, "last_modified": last_modified}
+    except Exception:
+        # onbellek yazilamazsa kosulsuz GET'e geri dusulur
+        pass
+
+
+# Tum kaziyicilarin paylastigi oturum: keep-alive ile ayni host'a TLS
+# el sikismasi bir kez yapilir, geciciler icin yeniden deneme vardir.
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": USER_AGENT})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+
+def _hurriyet_anasayfa_ayikla(html):
+    """Hurriyet ana sayfa HTML'inden haber listesi cikarir."""
+    haberler = []
+    goruldu = set()
+    # selectolax bayt kabul eder: requests'in govdeyi Python
+    # tarafinda decode etmesine gerek yok, kodlamayi Lexbor
+    # meta charset / Content-Type'tan kendisi cozer
+    tree = HTMLParser(html)
+    # tek zaman damgasi: anlami "bu tarama ne zaman yapildi"dir,
+    # link basina syscall + datetime nesnesi gerekmez
+    crawl_zamani = datetime.now()
+    for link_element in tree.css(_HURRIYET_LINK_SEL):
+        href = link_element.attributes.get("href")
+        if not href:
+            continue
+        if href.startswith("/"):
+            href = HURRIYET_BASE_URL + href
+        anahtar = _url_anahtari(href)
+        if anahtar in goruldu:
+            continue
+        # text(strip=True) zaten kirpilmis dondurur; ikinci bir
+        # strip() gereksiz. Bos baglanti metni icin title niteligi
+        # yedektir.
+        baslik = (link_element.text(strip=True)
+                  or link_element.attributes.get("title", ""))
+        if len(baslik) < 15:
+            continue
+        goruldu.add(anahtar)
+        haberler.append({
+            "baslik": baslik,
+            "url": href,
+            "kaynak": "hurriyet",
+            "tarih": crawl_zamani,
+            "eklenme_zamani": crawl_zamani,
+        })
+        if len(haberler) >= MAX_HABER:
+            break
+    return haberler
+
+
+def crawl_hurriyet():
+    """Hurriyet ana sayfasindan haber linklerini toplar."""
+    try:
+        response = _SESSION.get(
+            HURRIYET_BASE_URL, timeout=REQUEST_TIMEOUT,
+            headers=_kosul_basliklari(HURRIYET_BASE_URL))
+        if response.status_code == 304:
+            # sayfa son cekimden beri degismemis: indirme de parse da yok
+            return []
+        response.raise_for_status()
+        _dogrulayicilari_kaydet(HURRIYET_BASE_URL, response.headers)
+    except Exception as e:
+        print(f"Hurriyet crawl hatasi: {e}")
+        return []
+    return _hurriyet_anasayfa_ayikla(response.content)
+
+
+async def crawl_hurriyet_async(session):
+    """Hurriyet ana sayfasini paylasilan aiohttp oturumuyla tarar."""
+    try:
+        async with session.get(
+                HURRIYET_BASE_URL,
+                headers=_kosul_basliklari(HURRIYET_BASE_URL),
+                timeout=aiohttp.ClientTimeout(
+                    total=REQUEST_TIMEOUT)) as response:
+            if response.status == 304:
+                return []
+            response.raise_for_status()
+            _dogrulayicilari_kaydet(HURRIYET_BASE_URL, response.headers)
+            html = await response.read()
+    except Exception as e:
+        print(f"Hurriyet crawl hatasi: {e}")
+        return []
+    return await asyncio.to_thread(_hurriyet_anasayfa_ayikla, html)
+
+
+def _sayfa_parse(url, html, parsed_pages):
+    """Ayni URL'nin agacini kosu basina bir kez kurar.
+
+    parsed_pages kosuya ozel URL -> HTMLParser sozlugudur: secici
+    stratejisi ayni sayfayi birden cok kez suzmeye baslarsa Modest
+    parse'i tekrarlanmaz. Sozluk kosu bitiminde cagiranla birlikte
+    olur; agaclar kosular arasi tasinmaz.
+    """
+    tree = parsed_pages.get(url)
+    if tree is None:
+        tree = HTMLParser(html)
+        parsed_pages[url] = tree
+    return tree
+
+
+def _hurriyet_kategori_ayikla(url, html, kategori, haberler, goruldu,
+                              parsed_pages):
+    """Kategori sayfasi HTML'inden haber linklerini haberler'e ekler.
+
+    goruldu kumesi sayfalar arasi tekrarlari O(1) uyelik testiyle eler.
+    """
+    tree = _sayfa_parse(url, html, parsed_pages)
+    crawl_zamani = datetime.now()
+    for link_element in tree.css(_HURRIYET_LINK_SEL):
+        href = link_element.attributes.get("href")
+        if not href:
+            continue
+        if href.startswith("/"):
+            href = HURRIYET_BASE_URL + href
+        anahtar = _url_anahtari(href)
+        if anahtar in goruldu:
+            continue
+        baslik = (link_element.text(strip=True)
+                  or link_element.attributes.get("title", ""))
+        if len(baslik) < 15:
+            continue
+        goruldu.add(anahtar)
+        haberler.append({
+            "baslik": baslik,
+            "url": href,
+            "kaynak": "hurriyet",
+            "kategori": kategori or "anasayfa",
+            "tarih": crawl_zamani,
+            "eklenme_zamani": crawl_zamani,
+        })
+
+
+def _hurriyet_kategori_url(kategori):
+    return f"{HURRIYET_BASE_URL}/{kategori}" if kategori \
+        else HURRIYET_BASE_URL
+
+
+async def _kategori_indir(session, sem, url):
+    """Tek kategori sayfasini semafor sinirina uyarak indirir."""
+    async with sem:
+        async with session.get(
+                url,
+                timeout=aiohttp.ClientTimeout(
+                    total=REQUEST_TIMEOUT)) as response:
+            response.raise_for_status()
+            # ham baytlar dondurulur; decode isi parser'a birakilir
+            return await response.read()
+
+
+async def hurriyet_kategorileri_cek_async(session=None):
+    """Hurriyet kategori sayfalarini es zamanli indirir.
+
+    Nezaket, sayfa basina 2 sn'lik seri bekleme yerine host basina en
+    cok 4 es zamanli istekle saglanir; toplam sure en yavas sayfanin
+    suresine iner. Parse islemi donguyu bloklamasin diye sinirli bir
+    ThreadPoolExecutor'da calisir; Modest C seviyesinde parse ederken
+    GIL'i biraktigi icin sayfalar gercekten paralel ayiklanir. goruldu
+    kumesine es zamanli erisim zararsizdir: olasi cift girdiyi toplu
+    upsert zaten sunucu tarafinda eler. session verilirse (tum
+    kaynaklarin birlikte kosuldugu yol) o oturum paylasilir; verilmezse
+    fonksiyon kendi oturumunu acar.
+    """
+    haberler = []
+    goruldu = set()
+    parsed_pages = {}
+    sem = asyncio.Semaphore(4)
+    loop = asyncio.get_running_loop()
+    if session is not None:
+        sayfalar = await asyncio.gather(
+            *[_kategori_indir(session, sem, _hurriyet_kategori_url(k))
+              for k in HURRIYET_KATEGORILER],
+            return_exceptions=True)
+    else:
+        async with aiohttp.ClientSession(
+                headers={"User-Agent": USER_AGENT},
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=4)) as session:
+            sayfalar = await asyncio.gather(
+                *[_kategori_indir(session, sem, _hurriyet_kategori_url(k))
+                  for k in HURRIYET_KATEGORILER],
+                return_exceptions=True)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        gorevler = []
+        for kategori, html in zip(HURRIYET_KATEGORILER, sayfalar):
+            if isinstance(html, BaseException):
+                print(f"Hurriyet kategori hatasi "
+                      f"({_hurriyet_kategori_url(kategori)}): {html}")
+                continue
+            gorevler.append(loop.run_in_executor(
+                executor, _hurriyet_kategori_ayikla,
+                _hurriyet_kategori_url(kategori), html, kategori,
+                haberler, goruldu, parsed_pages))
+        if gorevler:
+            await asyncio.gather(*gorevler)
+    return haberler
+
+
+def hurriyet_kategorileri_cek():
+    """Hurriyet kategori sayfalarini tarar.
+
+    aiohttp kuruluysa sayfalar es zamanli indirilir; degilse eski seri
+    yol (sayfalar arasi 2 sn bekleyerek) kullanilir.
+    """
+    if aiohttp is not None:
+        return asyncio.run(hurriyet_kategorileri_cek_async())
+    haberler = []
+    goruldu = set()
+    parsed_pages = {}
+    for kategori in HURRIYET_KATEGORILER:
+        url = _hurriyet_kategori_url(kategori)
+        try:
+            response = _SESSION.get(url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            _hurriyet_kategori_ayikla(
+                url, response.content, kategori, haberler, goruldu,
+                parsed_pages)
+        except Exception as e:
+            print(f"Hurriyet kategori hatasi ({url}): {e}")
+        time.sleep(2)
+    return haberler
+
+
+def _sozcu_ayikla(html):
+    """Sozcu ana sayfa HTML'inden haber listesi cikarir."""
+    haberler = []
+    goruldu = set()
+    tree = HTMLParser(html)
+    crawl_zamani = datetime.now()
+    for link_element in tree.css(_SOZCU_LINK_SEL):
+        href = link_element.attributes.get("href")
+        if not href:
+            continue
+        # haber detay linklerinde son parca sayi icerir
+        if not _SOZCU_SON_PARCA_SAYILI_RE.search(href):
+            continue
+        anahtar = _url_anahtari(href)
+        if anahtar in goruldu:
+            continue
+        baslik = (link_element.text(strip=True)
+                  or link_element.attributes.get("title", ""))
+        if len(baslik) < 15:
+            continue
+        goruldu.add(anahtar)
+        haberler.append({
+            "baslik": baslik,
+            "url": href,
+            "kaynak": "sozcu",
+            "tarih": crawl_zamani,
+            "eklenme_zamani": crawl_zamani,
+        })
+        if len(haberler) >= MAX_HABER:
+            break
+    return haberler
+
+
+def crawl_sozcu():
+    """Sozcu ana sayfasindan haber linklerini toplar."""
+    try:
+        response = _SESSION.get(
+            SOZCU_BASE_URL, timeout=REQUEST_TIMEOUT,
+            headers=_kosul_basliklari(SOZCU_BASE_URL))
+        if response.status_code == 304:
+            return []
+        response.raise_for_status()
+        _dogrulayicilari_kaydet(SOZCU_BASE_URL, response.headers)
+    except Exception as e:
+        print(f"Sozcu crawl hatasi: {e}")
+        return []
+    return _sozcu_ayikla(response.content)
+
+
+async def crawl_sozcu_async(session):
+    """Sozcu ana sayfasini paylasilan aiohttp oturumuyla tarar."""
+    try:
+        async with session.get(
+                SOZCU_BASE_URL,
+                headers=_kosul_basliklari(SOZCU_BASE_URL),
+                timeout=aiohttp.ClientTimeout(
+                    total=REQUEST_TIMEOUT)) as response:
+            if response.status == 304:
+                return []
+            response.raise_for_status()
+            _dogrulayicilari_kaydet(SOZCU_BASE_URL, response.headers)
+            html = await response.read()
+    except Exception as e:
+        print(f"Sozcu crawl hatasi: {e}")
+        return []
+    return await asyncio.to_thread(_sozcu_ayikla, html)
+
+
+def manuel_crawler_kaydet(haberler, kaynak, collection, logs_collection):
+    """Toplanan haberleri tek toplu yazmayla kaydeder ve loglar.
+
+    Tekrar kontrolu haberleri_kaydet icindeki toplu upsert ile sunucu
+    tarafinda yapilir; haber basina find_one yoktur.
+    """
+    eklenen_sayi = haberleri_kaydet(haberler, collection)
+    logs_collection.insert_one({
+        "kaynak": kaynak,
+        "cekilen_haber_sayisi": len(haberler),
+        "eklenen_haber_sayisi": eklenen_sayi,
+        "basarili": True,
+        "cekim_zamani": datetime.now(),
+    })
+    return eklenen_sayi
+
+
+def _sonuclari_kaydet(sonuc_listesi, articles, logs):
+    """(kaynak, haberler) ciftlerini kaydedip ozet yazdirir."""
+    toplam = 0
+    for kaynak, haberler in sonuc_listesi:
+        eklenen = manuel_crawler_kaydet(haberler, kaynak, articles, logs)
+        toplam += eklenen
+        print(f"{kaynak}: {len(haberler)} haber tarandi, {eklenen} yeni")
+
+    print(f"Toplam {toplam} yeni haber eklendi.")
+    print(f"Koleksiyondaki haber sayisi: "
+          f"{articles.estimated_document_count()}")
+
+
+def manuel_crawlers_calistir():
+    """Tum manuel crawler'lari sirayla calistirip ozet yazdirir."""
+    db = get_db()
+    articles = db[KOLEKSIYON_ADI]
+    logs = db[LOG_KOLEKSIYON_ADI]
+    ensure_indexes(db)
+
+    _sonuclari_kaydet(
+        [("hurriyet", crawl_hurriyet()),
+         ("hurriyet", hurriyet_kategorileri_cek()),
+         ("sozcu", crawl_sozcu())],
+        articles, logs)
+
+
+async def manuel_crawlers_calistir_async():
+    """Tum manuel crawler'lari tek oturumda es zamanli calistirir.
+
+    Hurriyet ve Sozcu farkli host'lardir; kaynaklar asyncio.gather ile
+    yan yana kosuldugunda toplam sure kaynak surelerinin toplami degil
+    en yavas kaynagin suresi olur. Baglanti havuzu surec basina tektir
+    ve host basina 8 es zamanli istekle sinirlidir.
+    """
+    db = get_db()
+    articles = db[KOLEKSIYON_ADI]
+    logs = db[LOG_KOLEKSIYON_ADI]
+    ensure_indexes(db)
+
+    async with aiohttp.ClientSession(
+            headers={"User-Agent": USER_AGENT},
+            connector=aiohttp.TCPConnector(
+                limit=64, limit_per_host=8)) as session:
+        anasayfa, kategoriler, sozcu = await asyncio.gather(
+            crawl_hurriyet_async(session),
+            hurriyet_kategorileri_cek_async(session),
+            crawl_sozcu_async(session))
+
+    _sonuclari_kaydet(
+        [("hurriyet", anasayfa),
+         ("hurriyet", kategoriler),
+         ("sozcu", sozcu)],
+        articles, logs)
+
+
+if __name__ == "__main__":
+    if aiohttp is not None:
+        asyncio.run(manuel_crawlers_calistir_async())
+    else:
+        manuel_crawlers_calistir()
@@ -0,0 +1,329 @@
+"""
+RSS tabanli haber toplayici.
+
+Tanimli kaynaklarin RSS beslemelerini ceker, haberleri MongoDB'deki
+articles koleksiyonuna yazar ve her cekimi crawler_logs'a isler.
+"""
+
+import asyncio
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import feedparser
+import requests
+
+try:
+    from lxml import etree
+except ImportError:  # lxml yoksa feedparser ile devam edilir
+    etree = None
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp yoksa is parcacikli yol kullanilir
+    aiohttp = None
+from pymongo import UpdateOne
+from selectolax.parser import HTMLParser
+
+from config import (
+    KOLEKSIYON_ADI,
+    LOG_KOLEKSIYON_ADI,
+    REQUEST_DELAY,
+    REQUEST_TIMEOUT,
+    RSS_FEEDS,
+    USER_AGENT,
+)
+from database import ensure_indexes, get_db
+
+
+_THREAD_LOCAL = threading.local()
+
+
+def _get_session():
+    """Is parcacigi basina keep-alive yapan bir requests.Session verir.
+
+    Ayni host'un beslemeleri ayni worker'da sirayla cekildigi icin
+    oturumun baglanti havuzu TCP+TLS el sikismalarini bir kez oder.
+    """
+    session = getattr(_THREAD_LOCAL, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update({"User-Agent": USER_AGENT})
+        _THREAD_LOCAL.session = session
+    return session
+
+
+@lru_cache(maxsize=32)
+def _get_robot_parser(base_url):
+    """Host basina robots.txt'yi bir kez indirip parser'i onbellekler."""
+    rp = RobotFileParser()
+    rp.set_url(f"{base_url}/robots.txt")
+    rp.read()
+    return rp
+
+
+def robots_txt_kontrol(url):
+    """URL'nin robots.txt tarafindan izinli olup olmadigini kontrol eder."""
+    try:
+        parsed = urlparse(url)
+        base_url = f"{parsed.scheme}://{parsed.netloc}"
+        return _get_robot_parser(base_url).can_fetch("*", url)
+    except Exception:
+        # robots.txt okunamazsa cekimi engellemeyelim
+        return True
+
+
+def tarih_parse(entry):
+    """RSS girdisinden yayin tarihini cikarir; yoksa simdiki zamani kullanir."""
+    # FeedParserDict'te get() dogrudan sozluk erisimidir; getattr
+    # __getattr__ uzerinden AttributeError yakalamayi gerektirir.
+    published_parsed = (entry.get("published_parsed")
+                        or entry.get("updated_parsed"))
+    if published_parsed:
+        try:
+            return datetime(*published_parsed[:6])
+        except (TypeError, ValueError):
+            pass
+    return datetime.now()
+
+
+def _pubdate_parse(pubdate):
+    """RFC 822 pubDate degerini naif (UTC) datetime'a cevirir."""
+    if not pubdate:
+        return None
+    try:
+        dt = parsedate_to_datetime(pubdate)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _feed_girdileri(content):
+    """Besleme icerigindeki girdileri sozluk olarak uretir.
+
+    lxml kuruluysa yalnizca kullanilan etiketler (title, link,
+    description, pubDate) iterparse ile okunur; feedparser'in her oge
+    uzerinde calistirdigi HTML sanitizasyonu ve sezgisel tarih
+    cozumlemesi tamamen atlanir, bellek kullanimi O(1) kalir. lxml
+    yoksa feedparser ile ayni alanlar cikarilir.
+    """
+    if etree is not None:
+        ctx = etree.iterparse(
+            io.BytesIO(content), events=("end",), tag="item", recover=True)
+        for _, elem in ctx:
+            yield {
+                "title": elem.findtext("title"),
+                "link": elem.findtext("link"),
+                "summary": elem.findtext("description"),
+                "published": _pubdate_parse(elem.findtext("pubDate")),
+            }
+            elem.clear()
+        return
+    feed = feedparser.parse(content)
+    for entry in feed.entries:
+        yield {
+            "title": entry.get("title"),
+            "link": entry.get("link"),
+            "summary": entry.get("summary") or entry.get("description"),
+            "published": tarih_parse(entry),
+        }
+
+
+def html_temizle(html):
+    """Ozet alanindaki HTML etiketlerini temizleyip duz metin dondurur.
+
+    selectolax hem str hem bytes kabul eder; response.content gibi ham
+    bayt verisi once Python tarafinda decode edilmeden dogrudan
+    parser'a verilebilir.
+    """
+    if not html:
+        return ""
+    tree = HTMLParser(html)
+    return tree.text(separator=" ", strip=True)
+
+
+def haberleri_kaydet(docs, collection):
+    """Haber listesini tek toplu upsert istegiyle yazar.
+
+    Her belge icin UpdateOne(..., {"$setOnInsert": doc}, upsert=True)
+    kullanilir: tekrar kontrolu ve ekleme tek atomik toplu istekte
+    sunucu tarafinda cozulur, yaygin durum olan mukerrer URL'ler hata
+    uretmeden atlanir. Benzersiz url indeksi gecerliligini korur.
+    """
+    if not docs:
+        return 0
+    ops = [
+        UpdateOne({"url": doc["url"]}, {"$setOnInsert": doc}, upsert=True)
+        for doc in docs
+    ]
+    result = collection.bulk_write(ops, ordered=False)
+    return result.upserted_count
+
+
+def _feed_isle(content, rss_url, kaynak, collection, logs_collection):
+    """Indirilmis besleme icerigini parse edip kaydeder ve loglar."""
+    # Girdi basina iki datetime.now() cagrisi yerine parti basina bir
+    # zaman damgasi; belgeler yalnizca ilkel BSON tipleri icerir.
+    simdi = datetime.now()
+    docs = []
+    for girdi in _feed_girdileri(content):
+        baslik = girdi["title"]
+        link = girdi["link"]
+        if not baslik or not link:
+            continue
+        docs.append({
+            "baslik": baslik.strip(),
+            "url": link,
+            "ozet": html_temizle(girdi["summary"]),
+            "kaynak": kaynak,
+            "tarih": girdi["published"] or simdi,
+            "eklenme_zamani": simdi,
+        })
+
+    eklenen_sayi = haberleri_kaydet(docs, collection)
+    logs_collection.insert_one({
+        "kaynak": kaynak,
+        "rss_url": rss_url,
+        "cekilen_haber_sayisi": len(docs),
+        "eklenen_haber_sayisi": eklenen_sayi,
+        "basarili": True,
+        "cekim_zamani": datetime.now(),
+    })
+    return eklenen_sayi
+
+
+def _hata_logla(rss_url, kaynak, hata, logs_collection):
+    """Basarisiz cekimi yazdirir ve crawler_logs'a isler."""
+    print(f"RSS cekim hatasi ({rss_url}): {hata}")
+    logs_collection.insert_one({
+        "kaynak": kaynak,
+        "rss_url": rss_url,
+        "cekilen_haber_sayisi": 0,
+        "eklenen_haber_sayisi": 0,
+        "basarili": False,
+        "hata": str(hata),
+        "cekim_zamani": datetime.now(),
+    })
+
+
+def rss_cek(rss_url, kaynak, collection, logs_collection):
+    """Tek bir RSS beslemesini ceker ve yeni haber sayisini dondurur."""
+    try:
+        if not robots_txt_kontrol(rss_url):
+            print(f"robots.txt izni yok, atlaniyor: {rss_url}")
+            return 0
+        response = _get_session().get(rss_url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return _feed_isle(
+            response.content, rss_url, kaynak, collection, logs_collection)
+    except Exception as e:
+        _hata_logla(rss_url, kaynak, e, logs_collection)
+        return 0
+
+
+def _kaynak_cek(kaynak, feed_listesi, collection, logs_collection):
+    """Tek kaynagin beslemelerini sirayla ceker.
+
+    Ayni host'a istekler arasinda REQUEST_DELAY beklenerek nazik
+    kalinir; kaynaklar arasi paralellik rss_crawler_calistir'dadir.
+    """
+    toplam = 0
+    for rss_url in feed_listesi:
+        eklenen = rss_cek(rss_url, kaynak, collection, logs_collection)
+        toplam += eklenen
+        print(f"{kaynak}: {rss_url} -> {eklenen} yeni haber")
+        time.sleep(REQUEST_DELAY)
+    return toplam
+
+
+def rss_crawler_calistir():
+    """Tum RSS kaynaklarini kaynak basina bir is parcacigiyla ceker."""
+    db = get_db()
+    articles = db[KOLEKSIYON_ADI]
+    logs = db[LOG_KOLEKSIYON_ADI]
+    ensure_indexes(db)
+
+    toplam = 0
+    with ThreadPoolExecutor(max_workers=len(RSS_FEEDS)) as executor:
+        futures = [
+            executor.submit(_kaynak_cek, kaynak, feed_listesi, articles, logs)
+            for kaynak, feed_listesi in RSS_FEEDS.items()
+        ]
+        for future in as_completed(futures):
+            toplam += future.result()
+
+    print(f"Toplam {toplam} yeni haber eklendi.")
+    # estimated_document_count koleksiyon meta verisinden okur;
+    # count_documents({}) gibi tum koleksiyonu taramaz.
+    print(f"Koleksiyondaki haber sayisi: "
+          f"{articles.estimated_document_count()}")
+
+
+async def _rss_cek_async(session, sem, rss_url, kaynak, collection,
+                         logs_collection):
+    """Tek beslemeyi aiohttp ile indirir, parse/kayit isini havuza atar."""
+    loop = asyncio.get_running_loop()
+    try:
+        izinli = await loop.run_in_executor(
+            None, robots_txt_kontrol, rss_url)
+        if not izinli:
+            print(f"robots.txt izni yok, atlaniyor: {rss_url}")
+            return 0
+        async with sem:
+            async with session.get(
+                    rss_url,
+                    timeout=aiohttp.ClientTimeout(
+                        total=REQUEST_TIMEOUT)) as response:
+                response.raise_for_status()
+                content = await response.read()
+        # feedparser/lxml ve MongoDB yazimi senkron kalir; dongu
+        # bloklanmasin diye varsayilan executor'da calistirilir.
+        return await loop.run_in_executor(
+            None, _feed_isle, content, rss_url, kaynak, collection,
+            logs_collection)
+    except Exception as e:
+        _hata_logla(rss_url, kaynak, e, logs_collection)
+        return 0
+
+
+async def rss_crawler_calistir_async():
+    """Tum beslemeleri tek aiohttp oturumuyla es zamanli ceker.
+
+    Host basina bir semafor ile ayni kaynaga es zamanli tek istek
+    gider (nezaket siniri); farkli kaynaklar paralel ilerler.
+    """
+    db = get_db()
+    articles = db[KOLEKSIYON_ADI]
+    logs = db[LOG_KOLEKSIYON_ADI]
+    ensure_indexes(db)
+
+    semaforlar = {kaynak: asyncio.Semaphore(1) for kaynak in RSS_FEEDS}
+    async with aiohttp.ClientSession(
+            headers={"User-Agent": USER_AGENT}) as session:
+        gorevler = [
+            _rss_cek_async(session, semaforlar[kaynak], rss_url, kaynak,
+                           articles, logs)
+            for kaynak, feed_listesi in RSS_FEEDS.items()
+            for rss_url in feed_listesi
+        ]
+        sonuclar = await asyncio.gather(*gorevler)
+
+    toplam = sum(sonuclar)
+    print(f"Toplam {toplam} yeni haber eklendi.")
+    print(f"Koleksiyondaki haber sayisi: "
+          f"{articles.estimated_document_count()}")
+
+
+if __name__ == "__main__":
+    if aiohttp is not None:
+        asyncio.run(rss_crawler_calistir_async())
+    else:
+        rss_crawler_calistir()
@@ -0,0 +1,49 @@
+"""
+Paylasilan MongoDB baglantisi.
+
+Tum crawler betikleri ayni MongoClient'i kullanir; baglanti havuzu ve
+sunucu el sikismasi surec basina bir kez kurulur.
+"""
+
+import atexit
+
+from pymongo import IndexModel, MongoClient
+
+from config import (KOLEKSIYON_ADI, LOG_KOLEKSIYON_ADI,
+                    MONGO_CONNECTION_STRING, VERITABANI_ADI)
+
+_CLIENT = MongoClient(MONGO_CONNECTION_STRING, maxPoolSize=50, w=1)
+# izleme (monitor) is parcacigi surec sonunda duzgun kapansin
+atexit.register(_CLIENT.close)
+_INDEXES_DONE = False
+
+
+def get_db():
+    """Paylasilan istemci uzerinden veritabani tanitici dondurur."""
+    return _CLIENT[VERITABANI_ADI]
+
+
+def ensure_indexes(db):
+    """Crawler indekslerini surec basina bir kez, toplu olarak kurar.
+
+    create_indexes tum IndexModel'leri tek gidis-donuste gonderir;
+    modul bayragi sayesinde sonraki cagrilar sunucuya hic gitmez.
+    articles indeksleri stats'in kaynak/zaman sayimlarini ve siralamali
+    listelemeyi COLLSCAN yerine indeks taramasiyla karsilar;
+    crawler_logs'taki cekim_zamani indeksi son-kosular sorgusunun
+    bellek ici siralamasini onler.
+    """
+    global _INDEXES_DONE
+    if _INDEXES_DONE:
+        return
+    db[KOLEKSIYON_ADI].create_indexes([
+        IndexModel([("url", 1)], unique=True),
+        IndexModel([("kaynak", 1)]),
+        IndexModel([("kaynak", 1), ("tarih", -1)]),
+        IndexModel([("kaynak", 1), ("eklenme_zamani", -1)]),
+        IndexModel([("eklenme_zamani", -1)]),
+    ])
+    db[LOG_KOLEKSIYON_ADI].create_indexes([
+        IndexModel([("cekim_zamani", -1)]),
+    ])
+    _INDEXES_DONE = True
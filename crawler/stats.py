@@ -0,0 +1,95 @@
+"""
+Veritabani istatistikleri.
+
+articles ve crawler_logs koleksiyonlarini ozetler: toplam ve kaynak
+bazinda haber sayilari, son 24 saat / son 1 saat eklenenler, en yeni
+haberler ve son crawler kosulari. Hedef 1M haberlik koleksiyonda da
+hizli kalmaktir.
+"""
+
+from datetime import datetime, timedelta
+
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+from config import KOLEKSIYON_ADI, LOG_KOLEKSIYON_ADI
+from database import ensure_indexes, get_db
+
+# Listeleme sorgulari icin ham BSON: belgeler partiden cikarken dict'e
+# acilmaz, yalnizca erisilen (zaten projeksiyonla daraltilmis) alanlar
+# cozulur. tz_aware=False acikca sabitlenir; karsilastirmalardaki naif
+# datetime'larla uyum varsayilan degisse de korunur.
+_RAW_CODEC = CodecOptions(document_class=RawBSONDocument, tz_aware=False)
+
+
+def _tek_sayi(facet_sonucu):
+    """$count cikti listesinden sayiyi okur; bos liste 0 demektir."""
+    return facet_sonucu[0]["n"] if facet_sonucu else 0
+
+
+def goster_istatistikler():
+    """Koleksiyon ozetini yazdirir.
+
+    Tum sayimlar tek $facet boru hattinda toplanir: ayri ayri
+    count_documents cagrilarinin 7+ gidis-donusu yerine sunucuya tek
+    aggregate istegi gider.
+    """
+    db = get_db()
+    # sayim ve siralama sorgularinin indeks kullanmasini garanti et
+    ensure_indexes(db)
+    articles = db[KOLEKSIYON_ADI]
+
+    simdi = datetime.now()
+    bir_gun_once = simdi - timedelta(hours=24)
+    bir_saat_once = simdi - timedelta(hours=1)
+
+    facet = list(articles.aggregate([{
+        "$facet": {
+            "toplam": [{"$count": "n"}],
+            "kaynak_bazinda": [
+                {"$group": {"_id": "$kaynak", "n": {"$sum": 1}}},
+                {"$sort": {"n": -1}},
+            ],
+            "son_24_saat": [
+                {"$match": {"eklenme_zamani": {"$gte": bir_gun_once}}},
+                {"$count": "n"},
+            ],
+            "son_1_saat": [
+                {"$match": {"eklenme_zamani": {"$gte": bir_saat_once}}},
+                {"$count": "n"},
+            ],
+        }
+    }]))[0]
+
+    print("=== VERITABANI ISTATISTIKLERI ===")
+    print(f"Toplam haber: {_tek_sayi(facet['toplam'])}")
+    for grup in facet["kaynak_bazinda"]:
+        print(f"  {grup['_id']}: {grup['n']}")
+    print(f"Son 24 saat: {_tek_sayi(facet['son_24_saat'])}")
+    print(f"Son 1 saat: {_tek_sayi(facet['son_1_saat'])}")
+
+    # Yalnizca yazdirilan alanlar cekilir; haber govdesi gibi buyuk
+    # alanlar agdan hic gecmez.
+    print("\n=== SON HABERLER ===")
+    # batch_size = limit: sonuc tek kisa indeks araligi taramasiyla,
+    # tek partide gelir; sunucu varsayilan buyuk partiyi doldurmaz.
+    articles_ham = db.get_collection(KOLEKSIYON_ADI, codec_options=_RAW_CODEC)
+    for haber in articles_ham.find(
+            {}, {"kaynak": 1, "baslik": 1, "_id": 0}, batch_size=3,
+    ).sort("eklenme_zamani", -1).limit(3):
+        print(f"  [{haber['kaynak']}] {haber['baslik'][:60]}")
+
+    print("\n=== SON CRAWLER KOSULARI ===")
+    logs_ham = db.get_collection(LOG_KOLEKSIYON_ADI, codec_options=_RAW_CODEC)
+    for log in logs_ham.find(
+            {}, {"basarili": 1, "kaynak": 1, "cekilen_haber_sayisi": 1,
+                 "cekim_zamani": 1, "_id": 0}, batch_size=5,
+    ).sort("cekim_zamani", -1).limit(5):
+        durum = "OK" if log.get("basarili") else "HATA"
+        print(f"  [{durum}] {log.get('kaynak')}: "
+              f"{log.get('cekilen_haber_sayisi', 0)} haber, "
+              f"{log.get('cekim_zamani')}")
+
+
+if __name__ == "__main__":
+    goster_istatistikler()
@@ -0,0 +1,469 @@
+"""
+Metin temizleme ve analiz araclari.
+
+Haber metinlerini embedding ve benzerlik aramasi icin hazirlar:
+HTML/URL temizligi, Turkce kucuk harfe cevirme, anahtar kelime
+cikarimi ve temel metin istatistikleri.
+"""
+
+import heapq
+import operator
+import re
+from functools import lru_cache
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow istege baglidir; yoksa seri yol kullanilir
+    pa = None
+    pc = None
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # selectolax yoksa HTML temizligi regex'le yapilir
+    HTMLParser = None
+
+# Regex desenleri modul yuklenirken bir kez derlenir; her TextProcessor
+# ornegi ayni derlenmis desenleri paylasir.
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+# Tek duz karakter sinifi: alternatifli eski desen uzun URL'lerde
+# geri izlemeye (backtracking) yol aciyordu. Sinif, eski desendeki
+# 0x24-0x5F araliginin kapsadigi / : ? = ; # gibi yol/sorgu
+# karakterlerini de icerir; URL ilk bolu isaretinde kesilmez.
+_URL_RE = re.compile(
+    r'https?://[A-Za-z0-9$\-_@.&+!*(),%/:?=;#~]+|%[0-9A-Fa-f]{2}')
+# E-posta adresleri RFC geregi ASCII'dir; re.ASCII ile \S/\w Unicode
+# tablolarina bakmadan calisir.
+_EMAIL_RE = re.compile(r'\S+@\S+\.\S+', re.ASCII)
+_MULTIPLE_SPACES_RE = re.compile(r'\s+')
+_PROBLEMATIC_CHARS_RE = re.compile(r'[^\w\sğüşıöçĞÜŞİÖÇ.,!?;:()\'"-]')
+# ASCII hizli yol: regex ile ayni secimi yapan 256 girisli ceviri
+# tablosu. Sadece ilk 128 giris kullanilir (text.isascii() garantisi).
+_ASCII_CLEAN_TABLE = bytes(
+    ord(' ') if c < 128 and _PROBLEMATIC_CHARS_RE.match(chr(c)) else c
+    for c in range(256)
+)
+_NUMBER_RE = re.compile(r'\d+')
+_SENT_SPLIT_RE = re.compile(r'[.!?]+')
+# clean() icin tum kaldirma adimlarinin tek gecislik birlesimi:
+# HTML etiketi | URL | %XX | e-posta | sorunlu karakter. Alternatif
+# sirasi tek tek calisan eski asamalarin sirasiyla ayni tutulmustur.
+_COMBINED_CLEAN_RE = re.compile(
+    r'<[^>]+>'
+    r'|https?://[A-Za-z0-9$\-_@.&+!*(),%/:?=;#~]+'
+    r'|%[0-9A-Fa-f]{2}'
+    r'|(?a:\S+@\S+\.\S+)'
+    r'|[^\w\sğüşıöçĞÜŞİÖÇ.,!?;:()\'"-]')
+# _COMBINED_CLEAN_RE'nin RE2 (Arrow) esi. RE2 (?a:...) grubunu ve
+# Unicode \w'yi desteklemez: \S zaten ASCII bosluk tumleyenidir,
+# \w'nin tuttugu harf/rakam kategorileri ise \p{L}\p{N}_ ile acikca
+# yazilir. Iki desen ayni girdide ayni secimi yapmalidir; clean_batch
+# bunu parite denetimiyle dogrular.
+_ARROW_COMBINED_CLEAN_PATTERN = (
+    r'<[^>]+>'
+    r'|https?://[A-Za-z0-9$\-_@.&+!*(),%/:?=;#~]+'
+    r'|%[0-9A-Fa-f]{2}'
+    r'|\S+@\S+\.\S+'
+    r'|[^\p{L}\p{N}_\s.,!?;:()\'"-]')
+
+# Turkce buyuk harfler (I -> ı, İ -> i .lower() ile yanlis cikar) ve
+# ASCII A-Z ayni tabloda. Tablo yalnizca Turkce'ye ozel ciftleri ve
+# ASCII'yi kapsar; Â Î Û gibi tablonun disindaki buyuk harfler icin
+# translate sonrasi .lower() gecisi hala gereklidir.
+_TURKISH_LOWER_TABLE = str.maketrans(
+    'İIÇĞÖŞÜABCDEFGHJKLMNOPQRSTUVWXYZ',
+    'iıçğöşüabcdefghjklmnopqrstuvwxyz')
+
+TURKISH_STOP_WORDS = {
+    've', 'bir', 'bu', 'da', 'de', 'için', 'ile', 'mi', 'mu', 'mü',
+    'ama', 'eğer', 'veya', 'gibi', 'kadar', 'daha', 'çok', 'en',
+    'her', 'ne', 'o', 'şu', 'ki', 'ya', 'ise', 'sonra', 'önce',
+    'olarak', 'olan', 'oldu', 'var', 'yok', 'ben', 'sen', 'biz',
+    'siz', 'onlar', 'ancak', 'fakat', 'çünkü', 'yani', 'hem',
+}
+
+
+class TextProcessor:
+    """Haber metinlerini temizleyip normallestirir."""
+
+    def __init__(self):
+        self._html_tag_pattern = _HTML_TAG_RE
+        self._url_pattern = _URL_RE
+        self._email_pattern = _EMAIL_RE
+        self._multiple_spaces = _MULTIPLE_SPACES_RE
+        self._problematic_chars = _PROBLEMATIC_CHARS_RE
+        self._lower_table = _TURKISH_LOWER_TABLE
+        self.stop_words = set(TURKISH_STOP_WORDS)
+        # Filtreleme icin degismez kopya: frozenset daha kucuk bellek
+        # izine sahiptir ve yerel degiskene baglanip kullanilir.
+        self._stop_words_fs = frozenset(self.stop_words)
+        # Ayni haber metni tekrar islendiginde anahtar kelimeler
+        # yeniden hesaplanmasin diye sinirli boyutta bir onbellek.
+        self._extract_keywords_cached = lru_cache(maxsize=128)(
+            self._extract_keywords_uncached)
+        # Bayrak kombinasyonu basina uretilmis dallanmasiz
+        # clean_for_embedding surumleri (bkz. _specialize_clean).
+        self._specialized = {}
+
+    def clean(self, text):
+        """Metni HTML, URL, e-posta ve sorunlu karakterlerden arindirir.
+
+        Kaldirma adimlari ayri ayri gecisler yerine tek birlesik
+        regex'le uygulanir; ardindan tek bosluk normalizasyonu kalir.
+        """
+        if not text:
+            return ''
+        text = _COMBINED_CLEAN_RE.sub(' ', text)
+        return self._multiple_spaces.sub(' ', text).strip()
+
+    def normalize_text(self, text):
+        """Metni temizler ve Turkce kurallara gore kucuk harfe cevirir."""
+        return self._turkish_lowercase(self.clean(text))
+
+    def _remove_html_tags(self, text):
+        if HTMLParser is not None:
+            # Gercek parser yorum/CDATA gibi regex'in kaciracagi
+            # durumlari da dogru isler ve C seviyesinde calisir.
+            return HTMLParser(text).text(separator=' ', strip=True)
+        return self._html_tag_pattern.sub(' ', text)
+
+    def _remove_urls(self, text):
+        return self._url_pattern.sub(' ', text)
+
+    def _remove_emails(self, text):
+        return self._email_pattern.sub(' ', text)
+
+    def _remove_problematic_chars(self, text):
+        if text.isascii():
+            # bytes.translate 256 girisli tablo uzerinden C dongusuyle
+            # calisir; Turkce haberlerde metnin buyuk kismi ASCII'dir.
+            return text.encode('ascii').translate(_ASCII_CLEAN_TABLE).decode('ascii')
+        return self._problematic_chars.sub(' ', text)
+
+    def _normalize_whitespace(self, text):
+        return self._multiple_spaces.sub(' ', text)
+
+    def _turkish_lowercase(self, text):
+        if text.isascii():
+            # ASCII metinde Turkce buyuk harf olamaz; CPython'un hizli
+            # ASCII lower cekirdegi yeterlidir.
+            return text.lower()
+        # Once translate: I ve İ dogru esleri almis olur, .lower() bu
+        # kucuk harflere artik dokunmaz. .lower() ise tabloda olmayan
+        # Â Î Û gibi sapkali buyuk harfleri indirir.
+        return text.translate(self._lower_table).lower()
+
+    def tokenize(self, text):
+        """Metni bosluklardan bolerek kelimelere ayirir."""
+        return text.split()
+
+    def remove_stop_words(self, tokens):
+        """Turkce durak kelimeleri listeden cikarir."""
+        sw = self._stop_words_fs
+        if not sw:
+            return list(tokens)
+        # sw yerel degiskeni sayesinde token basina LOAD_ATTR odenmez
+        return [token for token in tokens if token not in sw]
+
+    def extract_keywords(self, text, max_keywords=10, min_length=3,
+                         remove_stop_words=True, *, already_cleaned=False):
+        """Metindeki en sik gecen anlamli kelimeleri dondurur.
+
+        Cagiran taraf metni zaten clean_for_embedding'den gecirdiyse
+        already_cleaned=True ile en pahali adim atlanabilir.
+        """
+        cleaned = text if already_cleaned else self.clean_for_embedding(text)
+        return list(self._extract_keywords_cached(
+            cleaned, max_keywords, min_length, remove_stop_words))
+
+    def _extract_keywords_uncached(self, cleaned, max_keywords, min_length,
+                                   remove_stop_words):
+        # Uzunluk filtresi, durak kelime filtresi ve sayim tek
+        # geciste: ara token listeleri hic olusmaz.
+        sw = self._stop_words_fs if remove_stop_words else frozenset()
+        counts = {}
+        for token in self.tokenize(cleaned):
+            if len(token) < min_length or token in sw:
+                continue
+            counts[token] = counts.get(token, 0) + 1
+        top = heapq.nlargest(max_keywords, counts.items(),
+                             key=operator.itemgetter(1))
+        return tuple(word for word, _ in top)
+
+    def clean_for_embedding(self, text, remove_html=True, remove_urls=True,
+                            remove_emails=True, remove_extra_whitespace=True,
+                            lowercase=True, validate_length=False):
+        """Embedding uretimi oncesi metni istege bagli adimlarla temizler.
+
+        Ayni bayrak kombinasyonu icin dallanmalari cozulmus duz bir
+        fonksiyon bir kez uretilip onbelleklenir; sonraki cagrilar tek
+        dolayli cagridan ibarettir.
+        """
+        flags = (remove_html, remove_urls, remove_emails,
+                 remove_extra_whitespace, lowercase, validate_length)
+        specialized = self._specialized.get(flags)
+        if specialized is None:
+            specialized = self._specialized[flags] = \
+                self._specialize_clean(flags)
+        return specialized(text)
+
+    def _specialize_clean(self, flags):
+        """Verilen bayraklar icin if'siz clean_for_embedding uretir."""
+        (remove_html, remove_urls, remove_emails,
+         remove_extra_whitespace, lowercase, validate_length) = flags
+        lines = [
+            "def _clean(text, _self=_self):",
+            "    if not text:",
+            "        return ''",
+        ]
+        if remove_html:
+            lines.append("    text = _self._remove_html_tags(text)")
+        if remove_urls:
+            lines.append("    text = _self._remove_urls(text)")
+        if remove_emails:
+            lines.append("    text = _self._remove_emails(text)")
+        lines.append("    text = _self._remove_problematic_chars(text)")
+        if remove_extra_whitespace:
+            lines.append("    text = _self._normalize_whitespace(text)")
+        if lowercase:
+            lines.append("    text = _self._turkish_lowercase(text)")
+        lines.append("    text = text.strip()")
+        if validate_length:
+            # Ucuz on-kontrol: sinirlar icindeyken istisna mekanizmasi
+            # hic devreye girmez, raise yalnizca hatali durumda olur.
+            lines.append("    _len = len(text)")
+            lines.append("    if _len < _min_len or _len > _max_len:")
+            lines.append("        _validate_length(text)")
+        lines.append("    return text")
+        namespace = {'_self': self,
+                     '_validate_length': TextValidator.validate_length,
+                     '_min_len': TextValidator.MIN_LENGTH,
+                     '_max_len': TextValidator.MAX_LENGTH}
+        exec('\n'.join(lines), namespace)
+        return namespace['_clean']
+
+    def clean_batch(self, texts):
+        """Metin listesini toplu olarak normallestirir.
+
+        pyarrow kuruluysa temizleme Arrow'un C++ UTF-8 cekirdekleriyle
+        tum liste uzerinde vektorel calisir; kurulu degilse her metin
+        icin normalize_text cagrilir.
+        """
+        if pa is None:
+            return [self.normalize_text(text) for text in texts]
+        arr = pa.array([text or '' for text in texts], type=pa.string())
+        # Kaldirma adimlari seri yoldaki _COMBINED_CLEAN_RE ile ayni
+        # alternatif sirasiyla tek RE2 gecisinde uygulanir; cikti
+        # pyarrow'un kurulu olup olmamasina bagli degismez.
+        arr = pc.replace_substring_regex(
+            arr, pattern=_ARROW_COMBINED_CLEAN_PATTERN, replacement=' ')
+        arr = pc.replace_substring_regex(arr, pattern=r'\s+',
+                                         replacement=' ')
+        arr = pc.utf8_trim_whitespace(arr)
+        # Arrow'un utf8_lower'i Turkce I/İ kurallarini bilmez; kucuk
+        # harfe cevirme Python tarafinda yapilir.
+        out = [self._turkish_lowercase(text) for text in arr.to_pylist()]
+        # Parite denetimi: iki desen birbirinden saparsa sessizce
+        # farkli embedding'ler uretmek yerine gelistirmede yakalanir.
+        if __debug__ and out:
+            assert out[0] == self.normalize_text(texts[0] or ''), \
+                'clean_batch: Arrow yolu seri yoldan ayristi'
+        return out
+
+    def prepare_for_similarity_search(self, text):
+        """Benzerlik aramasi icin standart temizleme akisini uygular."""
+        return self.clean_for_embedding(text)
+
+
+class TextValidator:
+    """Metinlerin islenmeye uygun olup olmadigini denetler."""
+
+    MIN_LENGTH = 20
+    MAX_LENGTH = 50000
+
+    @staticmethod
+    def validate_length(text, min_length=MIN_LENGTH, max_length=MAX_LENGTH):
+        """Metin uzunlugu sinirlar disindaysa ValueError firlatir."""
+        text_length = len(text)
+        if text_length < min_length:
+            raise ValueError(
+                f"Metin cok kisa: {text_length} < {min_length}")
+        if text_length > max_length:
+            raise ValueError(
+                f"Metin cok uzun: {text_length} > {max_length}")
+        return True
+
+    @staticmethod
+    def is_meaningful_text(text):
+        """Metnin anlamli icerik tasiyip tasimadigini kabaca kontrol eder."""
+        if not text or text.isspace():
+            return False
+        word_count, total_length = _word_scan(text)
+        if word_count < 3:
+            return False
+        return 2 <= total_length / word_count <= 20
+
+
+def _word_scan(text):
+    """(kelime_sayisi, toplam_kelime_uzunlugu) ciftini tek bolmeyle hesaplar.
+
+    split C seviyesinde calisir, uzunluk toplami da map(len) ile
+    kelime basina Python cerceve maliyeti odenmeden alinir.
+    """
+    words = text.split()
+    return len(words), sum(map(len, words))
+
+
+_TURKISH_CHAR_SET = frozenset('çÇğĞıİöÖşŞüÜ')
+_SENTENCE_END_SET = frozenset('.!?')
+
+
+def _scan_all(text):
+    """Tum istatistik sayaclarini metin uzerinde tek geciste toplar.
+
+    (bosluk_sayisi, kelime_sayisi, cumle_sayisi, sayi_adedi,
+    turkce_karakter_sayisi, toplam_kelime_uzunlugu) dondurur.
+    """
+    nspaces = 0
+    nwords = 0
+    nsentences = 0
+    nnumbers = 0
+    nturkish = 0
+    total_word_len = 0
+    in_word = False
+    in_digit = False
+    sentence_has_content = False
+    for char in text:
+        if char == ' ':
+            nspaces += 1
+        if char.isspace():
+            in_word = False
+            in_digit = False
+            continue
+        if not in_word:
+            nwords += 1
+            in_word = True
+        total_word_len += 1
+        if char in _SENTENCE_END_SET:
+            if sentence_has_content:
+                nsentences += 1
+                sentence_has_content = False
+            in_digit = False
+            continue
+        sentence_has_content = True
+        if char.isdigit():
+            if not in_digit:
+                nnumbers += 1
+                in_digit = True
+        else:
+            in_digit = False
+            if char in _TURKISH_CHAR_SET:
+                nturkish += 1
+    if sentence_has_content:
+        nsentences += 1
+    return nspaces, nwords, nsentences, nnumbers, nturkish, total_word_len
+
+
+class TextStatistics:
+    """Haber metinleri uzerinde temel sayisal istatistikler."""
+
+    TURKISH_CHARS = 'çÇğĞıİöÖşŞüÜ'
+
+    @staticmethod
+    def count_characters(text, include_spaces=True):
+        if include_spaces:
+            return len(text)
+        else:
+            # str.count C seviyesinde tarar; replace gibi yeni bir
+            # string kopyasi olusturmaz.
+            return len(text) - text.count(' ')
+
+    @staticmethod
+    def count_words(text):
+        return len(text.split())
+
+    @staticmethod
+    def count_sentences(text):
+        return sum(1 for s in _SENT_SPLIT_RE.split(text)
+                   if s and not s.isspace())
+
+    @staticmethod
+    def count_numbers(text):
+        return len(_NUMBER_RE.findall(text))
+
+    @staticmethod
+    def count_turkish_chars(text):
+        return sum(1 for char in text if char in TextStatistics.TURKISH_CHARS)
+
+    @staticmethod
+    def average_word_length(text):
+        word_count, total_length = _word_scan(text)
+        if not word_count:
+            return 0.0
+        return total_length / word_count
+
+    @staticmethod
+    def is_turkish_text(text):
+        """Turkce'ye ozgu karakter oranina gore dil tahmini yapar."""
+        if not text:
+            return False
+        # str.count C seviyesinde tarar; karakter basina Python
+        # dongusu yerine 12 hizli tarama yapilir.
+        turkish_count = sum(
+            text.count(char) for char in TextStatistics.TURKISH_CHARS)
+        return turkish_count / len(text) > 0.005
+
+    @staticmethod
+    def get_statistics(text):
+        """Metin icin tum istatistikleri tek sozlukte toplar.
+
+        Sayaclarin her biri icin metni bastan taramak yerine _scan_all
+        ile tek geciste toplanan degerlerden sozluk kurulur.
+        """
+        nchars = len(text)
+        nspaces, nwords, nsentences, nnumbers, nturkish, total_word_len = \
+            _scan_all(text)
+        return {
+            'karakter_sayisi': nchars,
+            'bosluksuz_karakter_sayisi': nchars - nspaces,
+            'kelime_sayisi': nwords,
+            'cumle_sayisi': nsentences,
+            'sayi_adedi': nnumbers,
+            'turkce_karakter_sayisi': nturkish,
+            'ortalama_kelime_uzunlugu': (
+                total_word_len / nwords if nwords else 0.0),
+            'turkce_metin_mi': (
+                nturkish / nchars > 0.005 if nchars else False),
+        }
+
+
+_DEFAULT_PROCESSOR = None
+
+
+def _get_default_processor():
+    """Kisa yol fonksiyonlarinin paylastigi TextProcessor'i dondurur.
+
+    Ornek ilk kullanimda bir kez kurulur; durak kelime kumesi,
+    uretilen ozel fonksiyonlar ve anahtar kelime onbellegi surec
+    boyunca paylasillir.
+    """
+    global _DEFAULT_PROCESSOR
+    if _DEFAULT_PROCESSOR is None:
+        _DEFAULT_PROCESSOR = TextProcessor()
+    return _DEFAULT_PROCESSOR
+
+
+def clean_text(text):
+    """Kisa yol: metni varsayilan islemciyle temizler."""
+    return _get_default_processor().clean(text)
+
+
+def normalize_text(text):
+    """Kisa yol: metni varsayilan islemciyle normallestirir."""
+    return _get_default_processor().normalize_text(text)
+
+
+def extract_keywords(text, max_keywords=10):
+    """Kisa yol: varsayilan islemciyle anahtar kelimeleri cikarir."""
+    return _get_default_processor().extract_keywords(
+        text, max_keywords=max_keywords)